@@ -15,6 +15,12 @@ from airflow.utils.dates import cron_presets, days_ago
 from croniter import croniter
 from fastapi import HTTPException, status
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
 from app.base_deployment import Deployment
 from app.models import Stage
 from app.utils import _get_config
@@ -39,8 +45,9 @@ class AirflowDeployment(Deployment):
             stage (Stage): New stage of the model.
         """
         super().__init__(name=name, stage=stage, version=version, suffix=suffix)
-        self.airflow = {'airflow': airflow}
+        self.airflow = {'airflow': dict(airflow or {})}
         self.dag_location = Path(_get_config(('airflow', 'dag_location')))
+        self._airflow_container = None
 
     def deploy_model(self):
         """Abstract method to deploy model."""
@@ -57,7 +64,7 @@ class AirflowDeployment(Deployment):
             self.airflow['airflow']['schedule_interval']
         )
         with open(str(self.dag_location / f'{self.deployment_name}.yaml'), 'w') as file:
-            yaml.safe_dump(self.airflow, file)
+            yaml.dump(self.airflow, file, Dumper=SafeDumper)
 
     def undeploy_model(self, removed_containers: list):
         """Abstract method to undeploy model."""
@@ -65,6 +72,25 @@ class AirflowDeployment(Deployment):
             if removed_container.labels.get('batch_prediction', False) in [True, 'True']:
                 self.remove_dag(by=['name'], name=removed_container.name)
 
+    def redeploy_model(self, removed_containers: list, deploy: bool):
+        """Undeploy DAGs of removed containers and deploy the new DAG with one Docker connection.
+
+        Args:
+            removed_containers (list): Containers whose DAGs should be removed.
+            deploy (bool): Whether the DAG of this deployment should be deployed afterwards.
+        """
+        self.undeploy_model(removed_containers)
+        if deploy:
+            self.deploy_model()
+
+    def _get_airflow_container(self):
+        """Get the Airflow container, connecting to Docker only once per instance."""
+        if self._airflow_container is None:
+            docker_client = docker.from_env()
+            airflow_container_id = _get_config(('airflow', 'container_id'))
+            self._airflow_container = docker_client.containers.get(airflow_container_id)
+        return self._airflow_container
+
     def remove_dag(self, by: List[str], name: str = None):
         def remove_by(by_regex: re.Pattern = None, by_name: str = None):
             dags = set()
@@ -114,9 +140,9 @@ class AirflowDeployment(Deployment):
             tmp_dags = remove_by(by_name=name)
             dags.update(tmp_dags)
 
-        docker_client = docker.from_env()
-        airflow_container_id = _get_config(('airflow', 'container_id'))
-        airflow_container = docker_client.containers.get(airflow_container_id)
+        if len(dags) == 0:
+            return
+        airflow_container = self._get_airflow_container()
 
         for dag in dags:
             output = airflow_container.exec_run(
@@ -136,7 +162,7 @@ class AirflowDeployment(Deployment):
         for entry in os.scandir(dag_location):
             if entry.is_file() and regex_all.match(entry.name):
                 with open(entry.path, 'r') as file:
-                    config = yaml.safe_load(file)['airflow']
+                    config = yaml.load(file, Loader=SafeLoader)['airflow']
                 attrs = ['model', 'stage', 'version']
                 dags.append({k: v for k, v in config.items() if k in attrs})
         return dags
@@ -1,26 +1,29 @@
+import contextlib
+import fcntl
+import json
 import logging
 import os
-import random
-import re
+import secrets
 import socket
-import string
+import tempfile
 import time
 from abc import ABC, abstractmethod
-from typing import Tuple
+from typing import Dict, Iterator, Tuple
 
 import requests
 from bentoml.yatai.client import YataiClient, get_yatai_client
 from bentoml.yatai.locking.lock import LockType, lock
 from bentoml.yatai.proto.repository_pb2 import Bento as BentoPB
 from fastapi import HTTPException, status
-from requests.adapters import HTTPAdapter
-from urllib3.util.retry import Retry
 
 from app.models import Stage
-from app.utils import _get_config
+from app.utils import _clean_name, _get_config
 
 logger = logging.getLogger(f'coordinator.{__name__}')
 
+# Ports claimed by deployments in progress, shared by all coordinator processes
+PORT_RESERVATIONS_PATH = os.path.abspath('./envs/.port_reservations.json')
+
 
 class IDeployment(ABC):
     @abstractmethod
@@ -58,13 +61,13 @@ class Deployment(IDeployment, ABC):
         self.name = name
         self.version = version
         self.stage = stage.value
-        self.name_clean = re.sub(r'\W+', '', self.name).lower()
-        self.stage_clean = re.sub(r'\W+', '', self.stage).lower()
+        self.name_clean = _clean_name(self.name)
+        self.stage_clean = _clean_name(self.stage)
 
         if suffix is not None:
             self.suffix = suffix
         else:
-            self.suffix = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
+            self.suffix = secrets.token_hex(4)
         self.deployment_name = (
             f'{Deployment.prefix}_{self.name_clean}_{self.stage_clean}_{self.suffix}'
         )
@@ -121,49 +124,153 @@ class Deployment(IDeployment, ABC):
                 str_args += f' --{k}={v}'
         return str_args.lstrip()
 
-    def _is_service_healthy(self, port: int, retries: int, backoff_time: int = 1) -> bool:
+    def _is_service_healthy(self, port: int, timeout: float) -> bool:
         """Checks healthz endpoint of BentoML model for life.
 
+        Probes the port with an exponential backoff (50 ms doubling up to 1 s) and returns as
+        soon as the service answers.
+
         Args:
             port (int): Port of the deployed model.
-            retries (int): Number of retries before giving up.
+            timeout (float): Seconds to wait before giving up.
 
         Returns:
             bool: Whether service is reachable or not.
         """
         logger.debug('Checking for service health.')
-        logging.getLogger('urllib3.connectionpool').setLevel(logging.ERROR)
-        session = requests.Session()
-
-        # MonkeyPatching the backoff time
-        def custom_backoff_time(self):
-            return backoff_time
-
-        Retry.get_backoff_time = custom_backoff_time
-        retries = Retry(total=retries)
-        session.mount('http://', HTTPAdapter(max_retries=retries))
-        try:
-            response = session.get(f'http://localhost:{port}/healthz', timeout=1)
-            if response.status_code == 200:
-                logger.debug('Service up and running.')
-                return True
-        except Exception:
-            logger.debug('Health check unsuccessful.')
-        return False
+        deadline = time.monotonic() + timeout
+        delay = 0.05
+        while True:
+            try:
+                with socket.create_connection(('127.0.0.1', port), timeout=0.2):
+                    pass
+                response = requests.get(f'http://127.0.0.1:{port}/healthz', timeout=1)
+                if response.status_code == 200:
+                    logger.debug('Service up and running.')
+                    return True
+            except (OSError, requests.RequestException):
+                pass
+            if time.monotonic() + delay > deadline:
+                logger.debug('Health check unsuccessful.')
+                return False
+            time.sleep(delay)
+            delay = min(delay * 2, 1.0)
 
     def _is_port_in_use(self, port: int, retry: int = 3) -> bool:
-        """Checks if a given port is already in use.
+        """Checks if a given port is already in use by trying to bind it.
+
+        A busy port is probed every 100 ms for up to `retry - 1` seconds, so a stopping server
+        that releases the port is noticed quickly.
 
         Args:
             port (int): Given port to check.
-            retry (int, optional): Number of retries to check. Defaults to 3.
+            retry (int, optional): Number of seconds (plus one) to check. Defaults to 3.
 
         Returns:
             bool: Whether port is in use or not.
         """
-        for _ in range(retry):
+        deadline = time.monotonic() + retry - 1
+        while True:
             with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                if s.connect_ex(('localhost', port)) != 0:
+                s.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+                try:
+                    s.bind(('0.0.0.0', port))
                     return False
-            time.sleep(1)
+                except OSError:
+                    pass
+            if time.monotonic() >= deadline:
+                return True
+            time.sleep(0.1)
+
+    def _reserve_port(self, port: int, retry: int = 3) -> bool:
+        """Reserve a free port for this deployment until `_release_port` is called.
+
+        The reservation closes the gap between checking the port and the model server binding it,
+        in which a concurrent deployment could otherwise pick the same port. Reservations of
+        processes that no longer exist are ignored.
+
+        Args:
+            port (int): Port to reserve.
+            retry (int, optional): Number of seconds (plus one) to wait for the port. Defaults to 3.
+
+        Returns:
+            bool: Whether the port could be reserved.
+        """
+        if self._is_port_in_use(port, retry):
+            return False
+        with self._port_reservations() as reservations:
+            reservation = reservations.get(str(port))
+            if reservation is not None and reservation['name'] != self.deployment_name:
+                logger.debug(f'Port {port} is reserved by: {reservation["name"]}')
+                return False
+            if self._is_port_in_use(port, 1):
+                return False
+            reservations[str(port)] = {'name': self.deployment_name, 'pid': os.getpid()}
         return True
+
+    def _release_port(self, port: int):
+        """Release a port reserved by `_reserve_port`.
+
+        Args:
+            port (int): Reserved port.
+        """
+        with self._port_reservations() as reservations:
+            reservation = reservations.get(str(port))
+            if reservation is not None and reservation['name'] == self.deployment_name:
+                del reservations[str(port)]
+
+    @staticmethod
+    @contextlib.contextmanager
+    def _port_reservations() -> Iterator[Dict[str, dict]]:
+        """Open the port reservations exclusively and write them back atomically on exit.
+
+        An unreadable table, e.g. after a crash, is treated as empty.
+
+        Yields:
+            Iterator[Dict[str, dict]]: Reservations by port, without those of exited processes.
+        """
+        os.makedirs(os.path.dirname(PORT_RESERVATIONS_PATH), exist_ok=True)
+        # The table is replaced on write, so a separate file is locked
+        with open(f'{PORT_RESERVATIONS_PATH}.lock', 'a') as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                try:
+                    with open(PORT_RESERVATIONS_PATH, 'r') as file:
+                        reservations = json.load(file)
+                except (FileNotFoundError, json.JSONDecodeError):
+                    reservations = dict()
+                reservations = {
+                    port: reservation
+                    for port, reservation in reservations.items()
+                    if _is_process_alive(reservation['pid'])
+                }
+                yield reservations
+                with tempfile.NamedTemporaryFile(
+                    'w', dir=os.path.dirname(PORT_RESERVATIONS_PATH), delete=False
+                ) as file:
+                    try:
+                        json.dump(reservations, file)
+                    except BaseException:
+                        os.remove(file.name)
+                        raise
+                os.replace(file.name, PORT_RESERVATIONS_PATH)
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+
+def _is_process_alive(pid: int) -> bool:
+    """Check whether a process with the given pid exists.
+
+    Args:
+        pid (int): Process id.
+
+    Returns:
+        bool: Whether the process exists.
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        pass
+    return True
@@ -9,6 +9,11 @@ import yaml
 from airflow.decorators import dag
 from airflow.exceptions import AirflowFailException
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
 dag_id = Path(__file__).stem
 
 
@@ -26,7 +31,7 @@ def read_config() -> Tuple[Dict[str, Any], Dict[str, Any]]:
 
     logging.info(f'Loading config from "{str(config_file_path)}"')
     with config_file_path.open('r') as config_file:
-        config = yaml.safe_load(config_file)
+        config = yaml.load(config_file, Loader=SafeLoader)
     if 'airflow' not in config:
         raise AirflowFailException(
             f'Key "airflow" not found in config ({str(config_file_path.name)}).'
@@ -54,13 +54,16 @@ class DockerDeployment(Deployment):
             docker_client, find_by=['version', 'stage'], remove_container=False
         )
         port = args['port']
-        if self._is_port_in_use(port, 4):
+        if not self._reserve_port(port, 4):
             logger.error(f'Port {port} is already in use. Cleaning up...')
             self._start_model_server(docker_client, args, batch_prediction, stopped_containers)
             raise HTTPException(
                 status.HTTP_502_BAD_GATEWAY, detail=f'Port {port} is already in use.'
             )
-        self._start_model_server(docker_client, args, batch_prediction)
+        try:
+            self._start_model_server(docker_client, args, batch_prediction)
+        finally:
+            self._release_port(port)
         _, removed_containers = self._stop_model_server(
             docker_client,
             find_by=['version', 'stage'],
@@ -1,14 +1,25 @@
+import asyncio
 import logging
 import secrets
-from typing import Union
+from typing import Dict, Union
+from uuid import uuid4
 
-from fastapi import Depends, FastAPI, HTTPException, Response, status
+from fastapi import Depends, FastAPI, HTTPException, status
+from fastapi.responses import JSONResponse
 from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from starlette.concurrency import run_in_threadpool
+from starlette.middleware.gzip import GZipMiddleware
 from starlette.responses import RedirectResponse
 
 from app.airflow_deployment import AirflowDeployment
 from app.docker_deployment import DockerDeployment
-from app.models import DEFAULT_ARGS, DeployModelInput, RuntimeEnv, UndeployModelInput
+from app.models import (
+    DEFAULT_ARGS,
+    DeployModelInput,
+    JobStatus,
+    RuntimeEnv,
+    UndeployModelInput,
+)
 from app.prometheus_deployment import PrometheusDeployment
 from app.tmux_deployment import TmuxDeployment
 from app.utils import init_logger
@@ -21,8 +32,19 @@ app = FastAPI(
     description='A webservice that provides endpoints to manage ML-Model-Deployments via BentoML in tmux-sessions or Docker containers',
     version='1.0',
 )
+app.add_middleware(GZipMiddleware, minimum_size=1024)
 
 security = HTTPBasic()
+AUTH_FAIL_HEADERS = {"WWW-Authenticate": "Basic"}
+
+# Dashboards poll /running, so the tmux session list may be a few seconds old
+RUNNING_MAX_AGE = 5
+
+# Number of finished jobs kept for polling, older ones are evicted
+MAX_FINISHED_JOBS = 1000
+
+jobs: Dict[str, dict] = dict()
+job_queue: asyncio.Queue = None
 
 
 def authenticate(credentials: HTTPBasicCredentials = Depends(security)) -> str:
@@ -43,7 +65,7 @@ def authenticate(credentials: HTTPBasicCredentials = Depends(security)) -> str:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Incorrect credentials",
-            headers={"WWW-Authenticate": "Basic"},
+            headers=AUTH_FAIL_HEADERS,
         )
     return credentials.username
 
@@ -71,13 +93,15 @@ async def get_docs():
     return RedirectResponse(url='/docs')
 
 
-@app.post(
-    "/start",
-    dependencies=[Depends(authenticate)],
-    name='Deploy a BentoML Model',
-    tags=['Operations'],
-)
-async def start(model_content: DeployModelInput):
+def deploy(model_content: DeployModelInput) -> str:
+    """Deploy model and register it in Airflow and Prometheus.
+
+    Args:
+        model_content (DeployModelInput): Deployment request.
+
+    Returns:
+        str: Result message.
+    """
     runtime_env = get_runtime_env(model_content.runtime_env)
     runtime_env_instance = runtime_env(
         name=model_content.name, version=model_content.version, stage=model_content.stage
@@ -94,9 +118,10 @@ async def start(model_content: DeployModelInput):
         suffix=response['suffix'],
         stage=model_content.stage,
     )
-    airflow.undeploy_model(response['removed_containers'])
-    if model_content.batch_prediction is True and isinstance(model_content.airflow, dict):
-        airflow.deploy_model()
+    airflow.redeploy_model(
+        response['removed_containers'],
+        deploy=model_content.batch_prediction is True and isinstance(model_content.airflow, dict),
+    )
 
     prometheus = PrometheusDeployment(
         name=model_content.name,
@@ -106,18 +131,18 @@ async def start(model_content: DeployModelInput):
     )
     prometheus.deploy_model(DEFAULT_ARGS['port'])
 
-    return Response(
-        status_code=status.HTTP_200_OK, content=f'Started {response["deployment_name"]}'
-    )
+    return f'Started {response["deployment_name"]}'
 
 
-@app.post(
-    "/stop",
-    dependencies=[Depends(authenticate)],
-    name='Undeploy a BentoML Model',
-    tags=['Operations'],
-)
-async def stop(model_content: UndeployModelInput):
+def undeploy(model_content: UndeployModelInput) -> str:
+    """Undeploy model and remove it from Airflow and Prometheus.
+
+    Args:
+        model_content (UndeployModelInput): Undeployment request.
+
+    Returns:
+        str: Result message.
+    """
     runtime_env = get_runtime_env(model_content.runtime_env)
     runtime_env_instance = runtime_env(name=model_content.name, version=model_content.version)
     stopped_containers = runtime_env_instance.undeploy_model()
@@ -131,7 +156,100 @@ async def stop(model_content: UndeployModelInput):
     prometheus = PrometheusDeployment(name=model_content.name, version=model_content.version)
     prometheus.undeploy_model(stopped_containers)
 
-    return Response(status_code=status.HTTP_200_OK, content=f'Stopped {stopped_containers}')
+    return f'Stopped {stopped_containers}'
+
+
+async def process_jobs():
+    """Work through queued jobs one after another in a worker thread."""
+    while True:
+        job_id, func, model_content = await job_queue.get()
+        jobs[job_id]['status'] = JobStatus.RUNNING
+        try:
+            jobs[job_id]['detail'] = await run_in_threadpool(func, model_content)
+            jobs[job_id]['status'] = JobStatus.SUCCEEDED
+        except HTTPException as error:
+            jobs[job_id]['status'] = JobStatus.FAILED
+            jobs[job_id]['detail'] = error.detail
+        except Exception as error:
+            logger.exception(f'Job {job_id} failed.')
+            jobs[job_id]['status'] = JobStatus.FAILED
+            jobs[job_id]['detail'] = f'{type(error).__name__}: {error}'
+        finally:
+            job_queue.task_done()
+            evict_finished_jobs()
+
+
+def evict_finished_jobs():
+    """Remove the oldest finished jobs once more than MAX_FINISHED_JOBS are kept."""
+    finished = [
+        job_id
+        for job_id, job in jobs.items()
+        if job['status'] in (JobStatus.SUCCEEDED, JobStatus.FAILED)
+    ]
+    for job_id in finished[: max(len(finished) - MAX_FINISHED_JOBS, 0)]:
+        del jobs[job_id]
+
+
+async def enqueue_job(func, model_content) -> JSONResponse:
+    """Put job into the queue and return its id.
+
+    Args:
+        func (Callable): Function to run.
+        model_content (Union[DeployModelInput, UndeployModelInput]): Argument for func.
+
+    Returns:
+        JSONResponse: Job id with status code 202.
+    """
+    job_id = uuid4().hex
+    jobs[job_id] = {'status': JobStatus.PENDING, 'detail': None}
+    await job_queue.put((job_id, func, model_content))
+    logger.info(f'Queued job {job_id}: {func.__name__} {model_content.name}')
+    return JSONResponse(status_code=status.HTTP_202_ACCEPTED, content={'job_id': job_id})
+
+
+@app.on_event('startup')
+async def start_job_worker():
+    """Create job queue and start worker task."""
+    global job_queue
+    job_queue = asyncio.Queue()
+    # The event loop only keeps a weak reference to tasks
+    app.state.job_worker = asyncio.create_task(process_jobs())
+
+
+@app.post(
+    "/start",
+    dependencies=[Depends(authenticate)],
+    name='Deploy a BentoML Model',
+    tags=['Operations'],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def start(model_content: DeployModelInput):
+    return await enqueue_job(deploy, model_content)
+
+
+@app.post(
+    "/stop",
+    dependencies=[Depends(authenticate)],
+    name='Undeploy a BentoML Model',
+    tags=['Operations'],
+    status_code=status.HTTP_202_ACCEPTED,
+)
+async def stop(model_content: UndeployModelInput):
+    return await enqueue_job(undeploy, model_content)
+
+
+@app.get(
+    "/jobs/{job_id}",
+    dependencies=[Depends(authenticate)],
+    name='Get status of a job',
+    tags=['Information'],
+)
+async def get_job(job_id: str):
+    if job_id not in jobs:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND, detail=f'Job {job_id} not found.'
+        )
+    return {'job_id': job_id, **jobs[job_id]}
 
 
 @app.get(
@@ -139,9 +257,10 @@ async def stop(model_content: UndeployModelInput):
     name='List all deployed Models',
     tags=['Information'],
 )
-async def running():
+def running():
+    # Blocking docker, tmux and file calls, so FastAPI runs this in the thread pool
     return {
-        'tmux': TmuxDeployment.get_running_models(),
+        'tmux': TmuxDeployment.get_running_models(max_age=RUNNING_MAX_AGE),
         'docker': DockerDeployment.get_running_models(),
         'airflow': AirflowDeployment.get_running_models(),
         'prometheus': PrometheusDeployment.get_running_models(),
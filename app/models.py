@@ -1,21 +1,28 @@
 from enum import Enum
-from typing import Optional
+from typing import Any, Mapping, Optional
 
 from pydantic import BaseModel
 
 
-class RuntimeEnv(Enum):
+class RuntimeEnv(str, Enum):
     DOCKER = 'docker'
     TMUX = 'tmux'
 
 
-class Stage(Enum):
+class Stage(str, Enum):
     NONE = 'None'
     STAGING = 'Staging'
     PRODUCTION = 'Production'
     ARCHIVED = 'Archived'
 
 
+class JobStatus(str, Enum):
+    PENDING = 'pending'
+    RUNNING = 'running'
+    SUCCEEDED = 'succeeded'
+    FAILED = 'failed'
+
+
 class DeployModelInput(BaseModel):
     name: str
     version: str
@@ -23,9 +30,13 @@ class DeployModelInput(BaseModel):
     owner: str
     old_stage: Optional[Stage] = Stage.NONE
     runtime_env: RuntimeEnv
-    args: Optional[dict] = None
+    args: Optional[Mapping[str, Any]] = None
     batch_prediction: bool = False
-    airflow: Optional[dict] = None
+    airflow: Optional[Mapping[str, Any]] = None
+
+    class Config:
+        frozen = True
+        extra = 'forbid'
 
 
 class UndeployModelInput(BaseModel):
@@ -34,7 +45,11 @@ class UndeployModelInput(BaseModel):
     old_stage: Optional[Stage] = Stage.NONE
     runtime_env: RuntimeEnv
     batch_prediction: bool = False
-    airflow: Optional[dict] = None
+    airflow: Optional[Mapping[str, Any]] = None
+
+    class Config:
+        frozen = True
+        extra = 'forbid'
 
 
 DEFAULT_ARGS = {'port': 5000}
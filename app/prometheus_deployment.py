@@ -1,10 +1,20 @@
+import copy
+import hashlib
 import logging
+import os
 import re
+import tempfile
 from pathlib import Path
-from typing import List
+from typing import Dict, List, Tuple
 
 import yaml
 
+try:
+    from yaml import CSafeDumper as SafeDumper
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeDumper, SafeLoader
+
 from app.base_deployment import Deployment
 from app.models import Stage
 from app.utils import _get_config
@@ -13,6 +23,9 @@ logger = logging.getLogger(f'coordinator.{__name__}')
 
 
 class PrometheusDeployment(Deployment):
+
+    _targets_cache: Dict[Path, Tuple[int, bytes, list]] = dict()
+
     def __init__(
         self,
         name: str,
@@ -28,14 +41,54 @@ class PrometheusDeployment(Deployment):
             stage (Stage): New stage of the model.
         """
         super().__init__(name=name, stage=stage, version=version, suffix=suffix)
-        self.targets_path, self.targets = PrometheusDeployment.load_targets()
+        self.targets_path, self.targets_digest, self.targets = PrometheusDeployment.load_targets()
+        self.regex_by_suffix = re.compile(
+            r'^{}_{}_\w+_{}$'.format(PrometheusDeployment.prefix, self.name_clean, self.suffix)
+        )
+        self.regex_by_stage = re.compile(
+            r'^{}_{}_{}_\w+$'.format(PrometheusDeployment.prefix, self.name_clean, self.stage_clean)
+        )
 
     @classmethod
-    def load_targets(cls):
+    def load_targets(cls) -> Tuple[Path, bytes, list]:
+        """Load Prometheus targets, reusing the parsed file as long as it is unchanged.
+
+        Returns:
+            Tuple[Path, bytes, list]: Path of the targets file, digest of its content, copy of the targets.
+        """
         targets_path = Path(_get_config(('prometheus', 'targets')))
-        with open(targets_path, 'r') as file:
-            targets = yaml.safe_load(file)
-        return targets_path, targets
+        mtime = targets_path.stat().st_mtime_ns
+        cached = cls._targets_cache.get(targets_path)
+        if cached is None or cached[0] != mtime:
+            content = targets_path.read_bytes()
+            targets = yaml.load(content, Loader=SafeLoader)
+            cached = (mtime, hashlib.blake2b(content).digest(), targets)
+            cls._targets_cache[targets_path] = cached
+        return targets_path, cached[1], copy.deepcopy(cached[2])
+
+    def write_targets(self):
+        """Atomically replace the targets file, skipping the write if nothing changed."""
+        content = yaml.dump(self.targets, Dumper=SafeDumper).encode()
+        digest = hashlib.blake2b(content).digest()
+        if digest == self.targets_digest:
+            logger.debug('Prometheus targets unchanged.')
+            return
+        # A unique temporary file, so concurrent writers never replace each other's partial file
+        file = tempfile.NamedTemporaryFile(
+            dir=str(self.targets_path.parent), prefix=f'.{self.targets_path.name}.', delete=False
+        )
+        tmp_path = file.name
+        try:
+            with file:
+                file.write(content)
+            # NamedTemporaryFile is only readable by its owner, Prometheus may run as another user
+            mode = self.targets_path.stat().st_mode if self.targets_path.exists() else 0o644
+            os.chmod(tmp_path, mode & 0o777)
+            os.replace(tmp_path, str(self.targets_path))
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+        self.targets_digest = digest
 
     def deploy_model(self, port):
         """Abstract method to deploy model."""
@@ -55,56 +108,46 @@ class PrometheusDeployment(Deployment):
             }
         )
 
-        with open(self.targets_path, 'w') as file:
-            yaml.safe_dump(self.targets, file)
+        self.write_targets()
 
     def undeploy_model(self, removed_containers: list):
         """Abstract method to undeploy model."""
         for removed_container in removed_containers:
             self.remove_target(by=['name'], name=removed_container.name)
-        with open(self.targets_path, 'w') as file:
-            yaml.safe_dump(self.targets, file)
+        self.write_targets()
 
     def remove_target(self, by: List[str], name: str = None):
-        def remove_by(by_regex: re.Pattern = None, by_name: str = None):
-            to_delete = []
-            for target in self.targets:
-                if not isinstance(target, dict) or 'deployment_name' not in target.get(
-                    'labels', {}
-                ):
-                    continue
-                if by_regex is not None and by_regex.match(target['labels']['deployment_name']):
-                    to_delete.append(target)
-                if by_name is not None and target['labels']['deployment_name'] == name:
-                    to_delete.append(target)
-            return to_delete
-
-        to_delete = []
-        if 'suffix' in by:
-            regex_by_suffix = re.compile(
-                r'^{}_{}_\w+_{}$'.format(PrometheusDeployment.prefix, self.name_clean, self.suffix)
-            )
-            to_delete += remove_by(by_regex=regex_by_suffix)
-        if 'stage' in by:
-            regex_by_stage = re.compile(
-                r'^{}_{}_{}_\w+$'.format(
-                    PrometheusDeployment.prefix, self.name_clean, self.stage_clean
-                )
-            )
-            to_delete += remove_by(by_regex=regex_by_stage)
-        if 'name' in by:
-            if name is None:
-                raise ValueError('Parameter "name" cannot be None')
-            to_delete += remove_by(by_name=name)
-        if len(to_delete) > 0:
-            to_delete_info = [item['labels']['deployment_name'] for item in to_delete]
+        regex_by_suffix = self.regex_by_suffix if 'suffix' in by else None
+        regex_by_stage = self.regex_by_stage if 'stage' in by else None
+        if 'name' in by and name is None:
+            raise ValueError('Parameter "name" cannot be None')
+        by_name = name if 'name' in by else None
+
+        def should_remove(target) -> bool:
+            if not isinstance(target, dict) or 'deployment_name' not in target.get('labels', {}):
+                return False
+            deployment_name = target['labels']['deployment_name']
+            if regex_by_suffix is not None and regex_by_suffix.match(deployment_name):
+                return True
+            if regex_by_stage is not None and regex_by_stage.match(deployment_name):
+                return True
+            return by_name is not None and deployment_name == by_name
+
+        remaining_targets = []
+        to_delete_info = []
+        for target in self.targets:
+            if should_remove(target):
+                to_delete_info.append(target['labels']['deployment_name'])
+            else:
+                remaining_targets.append(target)
+        if len(to_delete_info) > 0:
             logger.info(f'Undeploying {to_delete_info} from Prometheus.')
-        self.targets = [target for target in self.targets if target not in to_delete]
+        self.targets = remaining_targets
 
     @classmethod
     def get_running_models(cls):
         """Abstract method to get running models."""
-        _, targets = cls.load_targets()
+        _, _, targets = cls.load_targets()
         target_list = [
             target
             for target in targets
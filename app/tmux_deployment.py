@@ -1,31 +1,210 @@
+import hashlib
 import json
 import logging
 import os
-import random
-import re
-import string
+import secrets
+import select
+import shlex
+import shutil
 import subprocess
 import tempfile
-from typing import List, Literal
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Literal, Optional, Tuple
 
-import libtmux
-import yaml
-from conda.cli.python_api import Commands, run_command
 from fastapi import HTTPException, status
-from libtmux.exc import LibTmuxException
 
 from app.base_deployment import Deployment
 from app.models import Stage
-from app.utils import _distinct, _get_config
+from app.utils import _get_config
+
+if TYPE_CHECKING:
+    import libtmux
 
 logger = logging.getLogger(f'coordinator.{__name__}')
 
+MODEL_LABELS = ['name', 'version', 'stage', 'port', 'workers']
+SESSION_FIELDS = MODEL_LABELS + ['conda_prefix', 'args']
+SESSION_FIELD_SEP = '|:|'
+SESSION_FORMAT = SESSION_FIELD_SEP.join(
+    ['#{session_name}'] + [f'#{{@model_{field}}}' for field in SESSION_FIELDS]
+)
+ENV_HASH_FILE = '.env_hash'
+# Written into a cached environment once cloning it has finished
+ENV_CACHE_COMPLETE_FILE = '.cache_complete'
+# Set by conda's shell hook; the base installation is used without activating it first
+CONDA_EXE = os.environ.get('CONDA_EXE', 'conda')
+# Output of conda/pip after which waiting for the command to finish is pointless
+ENV_FATAL_ERRORS = (
+    'ResolvePackageNotFound',
+    'PackagesNotFoundError',
+    'No matching distribution found',
+)
+
+CONTROL_SESSION = 'coordinator_control'
+BATCH_END_MARKER = 'coordinator_batch_end'
+
+# Working directory at import, all environment and cache paths are resolved against it
+_ROOT = os.path.abspath('.')
+_ENVS_ROOT = os.path.join(_ROOT, 'envs')
+# Environments by dependency hash, kept independently of deployed models
+_ENV_CACHE_ROOT = os.path.join(_ENVS_ROOT, '.cache')
+# Number of cached environments, the least recently used ones are evicted
+ENV_CACHE_SIZE = 5
+
+
+def _env_build_vars() -> Dict[str, str]:
+    """Environment for conda and pip subprocesses with persistent package caches.
+
+    Caches configured by the user take precedence.
+
+    Returns:
+        Dict[str, str]: Environment variables.
+    """
+    return {
+        'PIP_CACHE_DIR': os.path.join(_ROOT, 'pip-cache'),
+        'CONDA_PKGS_DIRS': os.path.join(_ROOT, 'conda-pkgs'),
+        **os.environ,
+    }
+
+
+class TmuxControlClient:
+    """Persistent tmux control mode (`tmux -C`) connection.
+
+    Commands are written to a single long-lived tmux client instead of spawning a tmux process
+    per command. The client keeps the otherwise idle CONTROL_SESSION attached.
+    """
+
+    def __init__(self, timeout: float = 10):
+        self._process: subprocess.Popen = None
+        self._buffer = b''
+        self._timeout = timeout
+        self._lock = threading.Lock()
+
+    def cmd(self, *args: str) -> List[str]:
+        """Run a tmux command over the control connection.
+
+        Args:
+            *args (str): tmux command and its arguments.
+
+        Raises:
+            RuntimeError: If tmux reports an error for the command.
+
+        Returns:
+            List[str]: Output lines of the command.
+        """
+        return self.batch([args])[0]
+
+    def batch(self, commands: List[Tuple[str, ...]]) -> List[List[str]]:
+        """Run several tmux commands as one command list, i.e. with a single write.
+
+        tmux aborts the rest of a command list after an error, so the end of the batch is
+        recognised by the output of a trailing marker command instead of counting replies.
+
+        Args:
+            commands (List[Tuple[str, ...]]): tmux commands with their arguments.
+
+        Raises:
+            RuntimeError: If tmux reports an error for any of the commands or does not answer.
+
+        Returns:
+            List[List[str]]: Output lines per command.
+        """
+        command_list = ' ; '.join(shlex.join(command) for command in commands)
+        outputs, errors = [], []
+        with self._lock:
+            if self._process is None or self._process.poll() is not None:
+                self._connect()
+            self._process.stdin.write(
+                f'{command_list}\ndisplay-message -p {BATCH_END_MARKER}\n'.encode()
+            )
+            self._process.stdin.flush()
+            deadline = time.monotonic() + self._timeout
+            while True:
+                is_error, lines = self._read_block(deadline)
+                if not is_error and lines == [BATCH_END_MARKER]:
+                    break
+                (errors if is_error else outputs).append(lines)
+        if errors:
+            raise RuntimeError(f'tmux command failed: {" ".join(errors[0])}')
+        return outputs
+
+    def _connect(self):
+        """Start the control mode client and consume the reply to its own attach command."""
+        self._process = subprocess.Popen(
+            ['tmux', '-C', 'new-session', '-A', '-s', CONTROL_SESSION],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+        )
+        self._buffer = b''
+        self._read_block(time.monotonic() + self._timeout)
+
+    def _read_block(self, deadline: float) -> Tuple[bool, List[str]]:
+        """Read the next %begin/%end block, skipping notifications in between.
+
+        Args:
+            deadline (float): `time.monotonic()` value after which tmux is considered unresponsive.
+
+        Raises:
+            RuntimeError: If the control mode client exited or did not answer in time.
+
+        Returns:
+            Tuple[bool, List[str]]: Whether the block is an error and its output lines.
+        """
+        lines = None
+        while True:
+            line = self._read_line(deadline)
+            if lines is None:
+                if line.startswith('%begin '):
+                    lines = []
+            elif line.startswith(('%end ', '%error ')):
+                return line.startswith('%error '), lines
+            else:
+                lines.append(line)
+
+    def _read_line(self, deadline: float) -> str:
+        """Read one line of the client's output, waiting at most until deadline.
+
+        The client is terminated on failure, as its output can no longer be matched to commands.
+
+        Args:
+            deadline (float): `time.monotonic()` value after which tmux is considered unresponsive.
+
+        Raises:
+            RuntimeError: If the control mode client exited or did not answer in time.
+
+        Returns:
+            str: Line without line break.
+        """
+        fd = self._process.stdout.fileno()
+        while b'\n' not in self._buffer:
+            remaining = deadline - time.monotonic()
+            readable = remaining > 0 and select.select([fd], [], [], remaining)[0]
+            chunk = os.read(fd, 65536) if readable else b''
+            if not chunk:
+                self._process.kill()
+                self._process.wait()
+                self._process = None
+                reason = 'exited' if readable else 'did not answer in time'
+                raise RuntimeError(f'tmux control mode client {reason}.')
+            self._buffer += chunk
+        line, self._buffer = self._buffer.split(b'\n', 1)
+        return line.decode('utf-8', errors='replace')
+
 
 class TmuxDeployment(Deployment):
 
     BENTOML_FLASK_SERVING_STR = 'Serving Flask app'
     BENTOML_GUNICORN_SERVING_STR = 'Booting worker'
 
+    _envs_cache: Dict[str, Tuple[int, List[str]]] = dict()
+    _server: 'libtmux.Server' = None
+    _control: TmuxControlClient = None
+    _sessions_snapshot: Tuple[float, List[dict]] = None
+
     def __init__(self, name: str, version: str, stage: Stage = Stage.NONE):
         """Create instance of tmux deployment technique.
 
@@ -38,15 +217,17 @@ class TmuxDeployment(Deployment):
         raise HTTPException(501, 'Tmux deployment is deprecated. Please use another method.')
 
         super().__init__(name=name, version=version, stage=stage)
-        name_clean = re.sub(r'\W+', '', self.name).lower()
-        stage_clean = re.sub(r'\W+', '', self.stage).lower()
-        random_string = ''.join(random.choices(string.ascii_lowercase + string.digits, k=8))
-        self.env_name = f'bentoml_{name_clean}_{stage_clean}_{random_string}'
-        self.env_name_general = f'bentoml_{name_clean}_{stage_clean}'
-        self.conda_prefix = os.path.abspath(os.path.join('./envs', self.env_name))
-        self.conda_prefix_general = os.path.abspath(os.path.join('./envs', self.env_name_general))
-        self.session_name = f'bentoml_{name_clean}_{stage_clean}_{random_string}'
-        self.session_name_general = f'bentoml_{name_clean}_{stage_clean}'
+        base_name = f'bentoml_{self.name_clean}_{self.stage_clean}'
+        random_string = secrets.token_hex(4)
+        self.env_name = f'{base_name}_{random_string}'
+        self.env_name_general = base_name
+        self.conda_prefix = os.path.join(_ENVS_ROOT, self.env_name)
+        self.conda_prefix_general = os.path.join(_ENVS_ROOT, self.env_name_general)
+        self.session_name = f'{base_name}_{random_string}'
+        self.session_name_general = base_name
+        self._sessions_cache = None
+        # Hash of a freshly solved env, cached once the deployment succeeded
+        self._env_hash_to_cache = None
 
     def deploy_model(self, args: dict):
         """Deploy model in tmux session.
@@ -57,12 +238,14 @@ class TmuxDeployment(Deployment):
         Raises:
             HTTPException: If port is already in use.
         """
-        server = libtmux.Server()
+        server = self._get_server()
+        # Session records are fetched once per deployment and reused until sessions change
+        self._sessions_cache = None
         self._create_env_from_model()
         # ? Nicht nur Version, sondern auch Stage???
         stopped_sessions = self._stop_model_server(find_by=['version'], kill_session=False)
         port = args['port']
-        if self._is_port_in_use(port, 4):
+        if not self._reserve_port(port, 4):
             logger.error(f'Port {port} is already in use. Cleaning up...')
             self._delete_env_if_exists(specific_prefix=self.conda_prefix)
             self._start_model_server(
@@ -72,14 +255,29 @@ class TmuxDeployment(Deployment):
                 status.HTTP_502_BAD_GATEWAY, detail=f'Port {port} is already in use.'
             )
         try:
-            self._start_model_server(server, args)
+            try:
+                self._start_model_server(server, args)
+            finally:
+                self._release_port(port)
             stopped_sessions = self._stop_model_server(
                 find_by=['stage', 'version'], kill_session=True, exclude=self.session_name
             )
-            for session in stopped_sessions:
-                self._delete_env_if_exists(
-                    exclude=self.conda_prefix, specific_prefix=session['used_conda_prefix']
+            prefixes = [
+                session['used_conda_prefix']
+                for session in stopped_sessions
+                if session['used_conda_prefix'] != self.conda_prefix
+            ]
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(
+                    executor.map(
+                        lambda prefix: self._delete_env_if_exists(
+                            exclude=self.conda_prefix, specific_prefix=prefix
+                        ),
+                        prefixes,
+                    )
                 )
+            if self._env_hash_to_cache is not None:
+                self._cache_env(self._env_hash_to_cache)
             logger.info(f'Deployed model in session: {self.session_name}')
             # ToDo: 'Unrecognized response type; displaying content as text.'
             return 'Deployed model'
@@ -97,6 +295,7 @@ class TmuxDeployment(Deployment):
             HTTPException: If tmux session could not be stopped.
         """
         # ToDo: Fix error "Model was not running"
+        self._sessions_cache = None
         stopped_sessions = self._stop_model_server(find_by=['version'], kill_session=True)
         for stopped_session in stopped_sessions:
             self._delete_env_if_exists(specific_prefix=stopped_session['used_conda_prefix'])
@@ -117,6 +316,8 @@ class TmuxDeployment(Deployment):
         version: str = None,
         session_name_start: str = None,
         return_only_sessions: bool = False,
+        sessions: List[dict] = None,
+        max_age: float = 0,
     ) -> List[dict]:
         """Get running models in tmux sessions.
 
@@ -124,49 +325,129 @@ class TmuxDeployment(Deployment):
             name (str, optional): Name of the model. Defaults to None.
             version (str, optional): Version of the model. Defaults to None.
             session_name_start (str, optional): String the session name starts with. Defaults to None.
-            return_only_sessions (bool, optional): If session objects should be returned. Defaults to False.
+            return_only_sessions (bool, optional): If the raw session records should be returned. Defaults to False.
+            sessions (List[dict], optional): Already fetched session records. Defaults to None.
+            max_age (float, optional): Seconds a previously fetched session list may be reused. Defaults to 0.
 
         Returns:
             List[dict]: Information about running models.
         """
-        server = libtmux.Server()
-        try:
-            sessions = server.list_sessions()
-        except LibTmuxException:
-            logger.info('No running tmux-Sessions found.')
-            return list()
+        if sessions is None:
+            sessions = cls._fetch_sessions_batched(max_age=max_age)
         sessions_fmt = []
         for session in sessions:
-            session_name = session.get('session_name')
+            session_name = session['session_name']
             if not session_name.startswith('bentoml_'):
                 continue
             if session_name_start is not None and not session_name.startswith(session_name_start):
                 continue
-            if name is not None and session.show_environment('model_name') != name:
+            if name is not None and session['name'] != name:
                 continue
-            if version is not None and session.show_environment('model_version') != version:
+            if version is not None and session['version'] != version:
                 continue
-            labels = ['name', 'version', 'stage', 'port', 'workers']
-            if not all(session.show_environment(f'model_{label}') for label in labels):
+            if not all(session[label] for label in MODEL_LABELS):
                 continue
             if return_only_sessions is True:
                 sessions_fmt.append(session)
             else:
-                sessions_fmt.append(
-                    {label: session.show_environment(f'model_{label}') for label in labels}
-                )
+                sessions_fmt.append({label: session[label] for label in MODEL_LABELS})
         if return_only_sessions is False:
             logger.debug(f'Running model sessions: {str(sessions_fmt)}')
         return sessions_fmt
 
+    @classmethod
+    def _get_server(cls) -> 'libtmux.Server':
+        """Get the tmux server shared by all instances.
+
+        Returns:
+            libtmux.Server: libtmux Server object.
+        """
+        if cls._server is None:
+            # Imported lazily, as tmux deployments are rarely used
+            import libtmux
+
+            cls._server = libtmux.Server()
+        return cls._server
+
+    @classmethod
+    def _get_control(cls) -> TmuxControlClient:
+        """Get the tmux control mode connection shared by all instances.
+
+        Returns:
+            TmuxControlClient: Control mode client.
+        """
+        if cls._control is None:
+            cls._control = TmuxControlClient()
+        return cls._control
+
+    @classmethod
+    def _fetch_sessions_batched(cls, max_age: float = 0) -> List[dict]:
+        """Read name and model options of all tmux sessions with a single tmux call.
+
+        Args:
+            max_age (float, optional): Seconds the last fetched session list may be reused. Defaults to 0.
+
+        Returns:
+            List[dict]: Session records containing 'session_name' and all SESSION_FIELDS.
+        """
+        snapshot = cls._sessions_snapshot
+        if max_age > 0 and snapshot is not None and time.monotonic() - snapshot[0] < max_age:
+            return snapshot[1]
+        # A plain tmux call, so listing neither needs tmux nor starts a tmux server
+        try:
+            response = subprocess.run(
+                ['tmux', 'list-sessions', '-F', SESSION_FORMAT],
+                capture_output=True,
+                text=True,
+                timeout=5,
+            )
+        except (FileNotFoundError, subprocess.TimeoutExpired):
+            logger.info('tmux is not available.')
+            return list()
+        sessions = []
+        if response.returncode != 0:
+            logger.info('No running tmux-Sessions found.')
+        else:
+            sessions = [cls._parse_session_record(line) for line in response.stdout.splitlines()]
+        cls._sessions_snapshot = (time.monotonic(), sessions)
+        return sessions
+
+    @staticmethod
+    def _parse_session_record(line: str) -> dict:
+        """Parse a line formatted with SESSION_FORMAT.
+
+        Args:
+            line (str): Output line of tmux.
+
+        Returns:
+            dict: Session record containing 'session_name' and all SESSION_FIELDS.
+        """
+        session_name, *values = line.split(SESSION_FIELD_SEP)
+        return {'session_name': session_name, **dict(zip(SESSION_FIELDS, values))}
+
+    def _get_sessions(self) -> List[dict]:
+        """Get session records, fetching them only once until sessions are created or killed.
+
+        Returns:
+            List[dict]: Session records.
+        """
+        if self._sessions_cache is None:
+            self._sessions_cache = self._fetch_sessions_batched()
+        return self._sessions_cache
+
+    def _invalidate_sessions(self):
+        """Drop cached session records after sessions were created or killed."""
+        self._sessions_cache = None
+        TmuxDeployment._sessions_snapshot = None
+
     def _start_model_server(
         self,
-        server: libtmux.Server,
+        server: 'libtmux.Server',
         args: dict,
-        existing_sessions: List[libtmux.Session] = None,
+        existing_sessions: List['libtmux.Session'] = None,
         raise_error: bool = True,
     ):
-        """Create session and set environment variables.
+        """Create session, set environment variables and model options.
 
         Args:
             server (libtmux.Server): libtmux Server object.
@@ -187,21 +468,35 @@ class TmuxDeployment(Deployment):
             if len(existing_sessions) == 0:
                 logger.debug('Old Sessions could not be found.')
                 if raise_error:
+                    from libtmux.exc import LibTmuxException
+
                     raise LibTmuxException('Old Sessions could not be found.')
             return
 
         session = server.new_session(session_name=self.session_name)
-        for k, v in _get_config('env_vars').items():
-            session.set_environment(k, v)
-        session.set_environment('model_name', self.name)
-        session.set_environment('model_version', self.version)
-        session.set_environment('model_stage', self.stage)
-        session.set_environment('model_conda_prefix', self.conda_prefix)
-        session.set_environment('args', json.dumps(args))
+        self._invalidate_sessions()
+        # Environment and model options are set with a single command list
+        model_options = {
+            'name': self.name,
+            'version': self.version,
+            'stage': self.stage,
+            'conda_prefix': self.conda_prefix,
+            'args': json.dumps(args),
+        }
+        self._get_control().batch(
+            [
+                ('set-environment', '-t', self.session_name, k, str(v))
+                for k, v in _get_config('env_vars').items()
+            ]
+            + [
+                ('set-option', '-t', self.session_name, f'@model_{k}', str(v))
+                for k, v in model_options.items()
+            ]
+        )
         self._launch_gunicorn_in_session(session, raise_error)
         logger.debug(f'Started model server: {session.name}.')
 
-    def _launch_gunicorn_in_session(self, session: libtmux.Session, raise_error: bool):
+    def _launch_gunicorn_in_session(self, session: 'libtmux.Session', raise_error: bool):
         """Launch Gunicorn in tmux session.
 
         Args:
@@ -212,18 +507,43 @@ class TmuxDeployment(Deployment):
             HTTPException: If model health check if unsuccessful.
         """
         pane = session.attached_pane
-        pane.send_keys(f'conda activate {self.conda_prefix}')
-        used_model = session.show_environment('model_name')
-        used_version = session.show_environment('model_version')
-        used_args = session.show_environment('args')
-        pane.send_keys(
-            f'bentoml serve-gunicorn {self.get_bentoml_args(json.loads(used_args))} {used_model}:{used_version}'
-        )
-        used_port = int(json.loads(used_args)['port'])
-        if not self._is_service_healthy(used_port, 20):
-            detail = '\n'.join(pane.capture_pane())
+        response = session.cmd('display-message', '-p', SESSION_FORMAT)
+        record = self._parse_session_record(response.stdout[0])
+        used_model = record['name']
+        used_version = record['version']
+        used_args = json.loads(record['args'])
+        # The first worker boot is signalled on a tmux channel, the health check starts after that
+        ready_channel = f'ready_{session.name}'
+        # Send a single command to the pane instead of typing each step separately
+        with tempfile.NamedTemporaryFile(
+            'w', prefix=f'launch_{session.name}_', suffix='.sh', delete=False
+        ) as launch_script:
+            launch_script.write(
+                '#!/bin/bash\n'
+                f'source activate {record["conda_prefix"]}\n'
+                f'bentoml serve-gunicorn {self.get_bentoml_args(used_args)} {used_model}:{used_version} 2>&1 '
+                f'| awk \'{{ print; fflush() }} !ready && index($0, "{self.BENTOML_GUNICORN_SERVING_STR}") '
+                f'{{ ready = 1; system("tmux wait-for -S {ready_channel}") }}\'\n'
+            )
+        os.chmod(launch_script.name, 0o755)
+        pane.send_keys(f'bash {launch_script.name}')
+        deadline = time.monotonic() + 20
+        try:
+            subprocess.run(['tmux', 'wait-for', ready_channel], timeout=20, check=True)
+            # Workers boot before the model is loaded, so the service itself has to answer as well
+            is_healthy = self._is_service_healthy(
+                int(used_args['port']), max(deadline - time.monotonic(), 0)
+            )
+        except (subprocess.TimeoutExpired, subprocess.CalledProcessError):
+            is_healthy = False
+        finally:
+            os.remove(launch_script.name)
+        if not is_healthy:
+            # Only the end of the output is relevant, the full scrollback may be huge
+            detail = '\n'.join(pane.cmd('capture-pane', '-p', '-J', '-S', '-200').stdout)
             pane.send_keys('C-c', enter=False, suppress_history=False)
             session.kill_session()
+            self._invalidate_sessions()
             logger.info(f'Could not deploy service: {detail}')
             if raise_error:
                 raise HTTPException(
@@ -246,37 +566,86 @@ class TmuxDeployment(Deployment):
         """
         logger.debug(f'Stopping possible running model server, kill_session={kill_session}.')
 
-        sessions = []
-        if 'version' in find_by:
-            sessions += self.get_running_models(
-                name=self.name, version=self.version, return_only_sessions=True
+        control = self._get_control()
+
+        def is_affected(session: dict) -> bool:
+            if (
+                'version' in find_by
+                and session['name'] == self.name
+                and session['version'] == self.version
+            ):
+                return True
+            return 'stage' in find_by and session['session_name'].startswith(
+                self.session_name_general
             )
-        if 'stage' in find_by:
-            sessions += self.get_running_models(
-                session_name_start=self.session_name_general, return_only_sessions=True
+
+        # Single pass over all sessions, so sessions matching version and stage appear only once
+        sessions = [
+            session
+            for session in self.get_running_models(
+                return_only_sessions=True, sessions=self._get_sessions()
             )
+            if is_affected(session)
+        ]
 
         stopped_sessions = []
-        for session in _distinct(sessions, 'name'):
-            if session.name == exclude:
+        for session in sessions:
+            session_name = session['session_name']
+            if session_name == exclude:
                 continue
-            session.attached_pane.send_keys('C-c', enter=False, suppress_history=False)
+            control.cmd('send-keys', '-t', session_name, 'C-c')
             stopped_sessions.append(
                 {
-                    'used_model': session.show_environment('model_name'),
-                    'used_version': session.show_environment('model_version'),
-                    'used_conda_prefix': session.show_environment('model_conda_prefix'),
-                    'used_args': session.show_environment('args'),
+                    'used_model': session['name'],
+                    'used_version': session['version'],
+                    'used_conda_prefix': session['conda_prefix'],
+                    'used_args': session['args'],
                 }
             )
-            logger.debug(f'Stopped model server: {session.name}')
+            logger.debug(f'Stopped model server: {session_name}')
             if kill_session:
-                logger.debug(f'Killing (old) session: {session.name}')
-                session.kill_session()
+                logger.debug(f'Killing (old) session: {session_name}')
+                control.cmd('kill-session', '-t', session_name)
+                self._invalidate_sessions()
         if len(stopped_sessions) == 0:
             logger.debug('No running sessions stopped.')
         return stopped_sessions
 
+    @classmethod
+    def _list_envs_cached(cls, envs_dir: str) -> List[str]:
+        """List conda environments in envs_dir, reusing the listing while envs_dir is unchanged.
+
+        Args:
+            envs_dir (str): Directory containing the conda environments.
+
+        Returns:
+            List[str]: Prefixes of the conda environments.
+        """
+        if not os.path.isdir(envs_dir):
+            return list()
+        mtime = os.stat(envs_dir).st_mtime_ns
+        cached = cls._envs_cache.get(envs_dir)
+        if cached is None or cached[0] != mtime:
+            envs = [
+                entry.path
+                for entry in os.scandir(envs_dir)
+                if entry.is_dir() and not entry.name.startswith('.')
+            ]
+            cached = (mtime, envs)
+            cls._envs_cache[envs_dir] = cached
+        return list(cached[1])
+
+    @classmethod
+    def _invalidate_envs_cache(cls, envs_dir: str):
+        """Drop the cached listing of envs_dir after an environment was created or removed.
+
+        The directory mtime alone can miss changes within the timestamp granularity.
+
+        Args:
+            envs_dir (str): Directory containing the conda environments.
+        """
+        cls._envs_cache.pop(envs_dir, None)
+
     def _delete_env_if_exists(self, exclude: str = '', specific_prefix: str = None) -> bool:
         """Check if conda enviornment exists and delete it.
 
@@ -288,7 +657,7 @@ class TmuxDeployment(Deployment):
             bool: Whether any conda enviornments could be deleted or not.
         """
         logger.debug(f'Deleting conda environments: {self.conda_prefix_general}')
-        envs = run_command(Commands.INFO, '--envs')[0].split()
+        envs = self._list_envs_cached(_ENVS_ROOT)
         found_envs = []
         if specific_prefix is not None and specific_prefix in envs:
             found_envs = [specific_prefix]
@@ -298,9 +667,12 @@ class TmuxDeployment(Deployment):
                 for env in envs
                 if self.conda_prefix_general in env and (not exclude or exclude not in env)
             ]
-        for env in found_envs:
-            run_command(Commands.REMOVE, '--all', '--prefix', env)
-            logger.debug(f'Removed conda env: {env}')
+        if found_envs:
+            # Prefix environments are self-contained directories, so conda is not needed to remove them
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(executor.map(lambda env: shutil.rmtree(env, ignore_errors=True), found_envs))
+            self._invalidate_envs_cache(_ENVS_ROOT)
+            logger.debug(f'Removed conda envs: {found_envs}')
         if len(found_envs) == 0:
             logger.debug(f'No conda environments found: {self.conda_prefix_general}')
             return False
@@ -318,26 +690,182 @@ class TmuxDeployment(Deployment):
         bentoml_model_env = bentoml_model.bento_service_metadata.env
         python_version = bentoml_model_env.python_version
         pip_packages = list(bentoml_model_env.pip_packages)
-        pip_packages = list(set(pip_packages + ['psycopg2-binary', 'boto3']))
-        config = {
-            'name': self.env_name,
-            'channels': ['defaults'],
-            'dependencies': [f'python={python_version}', 'pip', {'pip': pip_packages}],
-        }
-        with tempfile.TemporaryDirectory() as tmpdirname:
-            env_yml = os.path.join(tmpdirname, 'environment.yml')
-            with open(env_yml, 'w') as file:
-                yaml.safe_dump(config, file)
-            response = subprocess.run(
-                args=f'bash -c "source activate root; conda env create --prefix {self.conda_prefix} --file {env_yml}"',
-                timeout=240,
-                shell=True,
-                stdout=subprocess.PIPE,
-            )
-            if response.returncode < 0:
-                logger.error(f'Could not create conda env.\n{response.stderr.decode("utf-8")}')
-                raise HTTPException(
-                    status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-                    detail=f'Could not create conda env.\n{response.stderr.decode("utf-8")}',
+        pip_packages = list(dict.fromkeys(pip_packages + ['psycopg2-binary', 'boto3']))
+        dependencies = [f'python={python_version}', 'pip']
+        env_hash = hashlib.blake2b(
+            f"{python_version}|{','.join(sorted(pip_packages))}".encode(), digest_size=8
+        ).hexdigest()
+        matching_env = self._find_env_by_hash(env_hash)
+        if matching_env is not None:
+            logger.debug(f'Cloning conda environment with same dependencies: {matching_env}')
+            try:
+                self._run_env_command(
+                    [
+                        CONDA_EXE,
+                        'create',
+                        '--yes',
+                        '--offline',
+                        '--clone',
+                        matching_env,
+                        '--prefix',
+                        self.conda_prefix,
+                    ],
+                    'Could not clone conda env.',
                 )
-            logger.debug(f'Created new conda environment: {self.conda_prefix}')
+            except HTTPException:
+                # E.g. packages of the matching env are missing in the package cache
+                logger.info('Cloning failed, solving conda environment instead.')
+                shutil.rmtree(self.conda_prefix, ignore_errors=True)
+                matching_env = None
+        if matching_env is None:
+            # The spec is small enough to be passed as arguments, so no environment file is needed
+            if shutil.which('micromamba') is not None:
+                command = ['micromamba', 'create', '--yes', '--prefix', self.conda_prefix]
+            else:
+                command = [
+                    'mamba' if shutil.which('mamba') is not None else CONDA_EXE,
+                    'create',
+                    '--yes',
+                    '--prefix',
+                    self.conda_prefix,
+                ]
+            self._run_env_command(
+                [*command, '--channel', 'defaults', *dependencies], 'Could not create conda env.'
+            )
+            self._install_pip_packages(pip_packages)
+        with open(os.path.join(self.conda_prefix, ENV_HASH_FILE), 'w') as file:
+            file.write(env_hash)
+        self._invalidate_envs_cache(_ENVS_ROOT)
+        logger.debug(f'Created new conda environment: {self.conda_prefix}')
+        self._env_hash_to_cache = env_hash if matching_env is None else None
+
+    def _cache_env(self, env_hash: str):
+        """Keep a clone of the freshly created conda environment for later deployments.
+
+        The clone is created at its final location, as conda embeds the prefix in the cloned files.
+        ENV_CACHE_COMPLETE_FILE is written last, so an incomplete cache entry is never used.
+        Failing to cache does not fail the deployment.
+
+        Args:
+            env_hash (str): Hash of python version and pip packages.
+        """
+        cache_prefix = os.path.join(_ENV_CACHE_ROOT, env_hash)
+        if os.path.isfile(os.path.join(cache_prefix, ENV_CACHE_COMPLETE_FILE)):
+            return
+        # Remains of an interrupted clone
+        shutil.rmtree(cache_prefix, ignore_errors=True)
+        os.makedirs(_ENV_CACHE_ROOT, exist_ok=True)
+        try:
+            # Unlike a plain copy, cloning rewrites the embedded prefix, e.g. in shebangs
+            self._run_env_command(
+                [
+                    CONDA_EXE,
+                    'create',
+                    '--yes',
+                    '--offline',
+                    '--clone',
+                    self.conda_prefix,
+                    '--prefix',
+                    cache_prefix,
+                ],
+                'Could not cache conda env.',
+            )
+            with open(os.path.join(cache_prefix, ENV_CACHE_COMPLETE_FILE), 'w'):
+                pass
+            logger.debug(f'Cached conda environment: {cache_prefix}')
+        except (HTTPException, OSError):
+            shutil.rmtree(cache_prefix, ignore_errors=True)
+        self._evict_env_cache()
+
+    @staticmethod
+    def _evict_env_cache():
+        """Remove the least recently used cached environments beyond ENV_CACHE_SIZE."""
+        cached_envs = sorted(
+            (entry for entry in os.scandir(_ENV_CACHE_ROOT) if entry.is_dir()),
+            key=lambda entry: entry.stat().st_mtime,
+            reverse=True,
+        )
+        for entry in cached_envs[ENV_CACHE_SIZE:]:
+            shutil.rmtree(entry.path, ignore_errors=True)
+            logger.debug(f'Evicted cached conda environment: {entry.path}')
+
+    def _install_pip_packages(self, pip_packages: List[str]):
+        """Install pip packages into the conda environment using pip's own wheel cache.
+
+        Args:
+            pip_packages (List[str]): Packages to install.
+
+        Raises:
+            HTTPException: If pip packages could not be installed.
+        """
+        self._run_env_command(
+            [os.path.join(self.conda_prefix, 'bin', 'pip'), 'install', *pip_packages],
+            'Could not install pip packages.',
+        )
+        logger.debug(f'Installed pip packages in: {self.conda_prefix}')
+
+    @staticmethod
+    def _run_env_command(command: List[str], error_msg: str):
+        """Run a conda/pip command, streaming its output to abort as soon as it reports a fatal error.
+
+        Args:
+            command (List[str]): Command and its arguments.
+            error_msg (str): Message of the HTTPException if the command fails.
+
+        Raises:
+            HTTPException: If the command fails, reports a fatal error or times out.
+        """
+        tail = deque(maxlen=200)
+        with subprocess.Popen(
+            command,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            bufsize=1,
+            env=_env_build_vars(),
+        ) as process:
+            timer = threading.Timer(240, process.kill)
+            timer.start()
+            try:
+                for line in process.stdout:
+                    tail.append(line)
+                    if any(error in line for error in ENV_FATAL_ERRORS):
+                        process.kill()
+                        break
+            finally:
+                timer.cancel()
+        if process.returncode != 0:
+            output = ''.join(tail)
+            logger.error(f'{error_msg}\n{output}')
+            raise HTTPException(
+                status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+                detail=f'{error_msg}\n{output}',
+            )
+
+    def _find_env_by_hash(self, env_hash: str) -> Optional[str]:
+        """Find an existing conda environment with the same dependencies.
+
+        The hash only depends on python version and pip packages, so environments of other models
+        and stages are reused as well. The env cache is checked first, as it outlives undeployments.
+
+        Args:
+            env_hash (str): Hash of python version and pip packages.
+
+        Returns:
+            Optional[str]: Prefix of the matching conda environment.
+        """
+        cache_prefix = os.path.join(_ENV_CACHE_ROOT, env_hash)
+        if os.path.isfile(os.path.join(cache_prefix, ENV_CACHE_COMPLETE_FILE)):
+            # The modification time orders the cache for eviction
+            os.utime(cache_prefix)
+            return cache_prefix
+        for env in self._list_envs_cached(_ENVS_ROOT):
+            if env == self.conda_prefix:
+                continue
+            hash_path = os.path.join(env, ENV_HASH_FILE)
+            if not os.path.isfile(hash_path):
+                continue
+            with open(hash_path, 'r') as file:
+                if file.read().strip() == env_hash:
+                    return env
+        return None
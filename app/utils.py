@@ -1,9 +1,26 @@
+import copy
 import logging
 import os
-from typing import Any, List, Union
+import re
+import string
+from operator import attrgetter
+from typing import Any, Dict, List, Tuple, Union
 
 import yaml
 
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
+
+_WORD_CHARS = frozenset(string.ascii_letters + string.digits + '_')
+_NON_WORD_TABLE = str.maketrans(
+    '', '', ''.join(c for c in map(chr, range(128)) if c not in _WORD_CHARS)
+)
+_NON_WORD_RE = re.compile(r'\W+')
+
+_config_cache: Dict[str, Tuple[int, dict]] = dict()
+
 
 def init_logger():
     """Configure root logger and set log level for coordinator logger.
@@ -18,6 +35,26 @@ def init_logger():
     # ToDo: Write normal exceptions to file as well
 
 
+def _load_config() -> dict:
+    """Read and parse config file, reusing the parsed config while the file is unchanged.
+
+    Returns:
+        dict: Parsed config or empty dict if there is no config file.
+    """
+    current_dir = os.path.dirname(os.path.realpath(__file__))
+    config_path = os.path.join(current_dir, 'config.yaml')
+    try:
+        mtime = os.stat(config_path).st_mtime_ns
+    except FileNotFoundError:
+        return dict()
+    cached = _config_cache.get(config_path)
+    if cached is None or cached[0] != mtime:
+        with open(config_path, 'r') as file:
+            cached = (mtime, yaml.load(file, Loader=SafeLoader) or dict())
+        _config_cache[config_path] = cached
+    return cached[1]
+
+
 def _get_config(key_or_path: Union[str, tuple]) -> dict:
     """Read config file.
 
@@ -27,14 +64,9 @@ def _get_config(key_or_path: Union[str, tuple]) -> dict:
     Returns:
         dict: Config by key/path.
     """
-    current_dir = os.path.dirname(os.path.realpath(__file__))
-    config_path = os.path.join(current_dir, 'config.yaml')
-    if not os.path.exists(config_path):
-        return dict()
-    with open(config_path, 'r') as file:
-        config = yaml.safe_load(file)
+    config = _load_config()
     if isinstance(key_or_path, str) and key_or_path in config:
-        return config[key_or_path] or dict()
+        return copy.deepcopy(config[key_or_path]) or dict()
     elif isinstance(key_or_path, tuple):
         for path_ele in key_or_path:
             if config is None:
@@ -42,13 +74,15 @@ def _get_config(key_or_path: Union[str, tuple]) -> dict:
             if path_ele in config:
                 config = config[path_ele]
         else:
-            return config
+            return copy.deepcopy(config)
     return dict()
 
 
 def _distinct(obj_list: List[Any], attr: str) -> List[Any]:
     """Reduce list of unhashable objects to distinct occurences.
 
+    Hashable attribute values are compared via a set, unhashable ones by scanning the kept objects.
+
     Args:
         obj_list (List[Any]): List of unhashable objects.
         attr (str): Attribute for comparison.
@@ -56,11 +90,33 @@ def _distinct(obj_list: List[Any], attr: str) -> List[Any]:
     Returns:
         List[Any]: Reduced list of distinct objects.
     """
+    key = attrgetter(attr)
+    seen = set()
     distinct_obj_list: list = []
     for obj in obj_list:
-        for distinct_obj in distinct_obj_list:
-            if getattr(obj, attr) == getattr(distinct_obj, attr):
-                break
-        else:
-            distinct_obj_list.append(obj)
+        value = key(obj)
+        try:
+            if value in seen:
+                continue
+            seen.add(value)
+        except TypeError:
+            if any(key(distinct_obj) == value for distinct_obj in distinct_obj_list):
+                continue
+        distinct_obj_list.append(obj)
     return distinct_obj_list
+
+
+def _clean_name(value: str) -> str:
+    """Remove non-word characters and lowercase the value.
+
+    ASCII values, which is the common case, use a translation table instead of the regex.
+
+    Args:
+        value (str): Value to clean.
+
+    Returns:
+        str: Cleaned value.
+    """
+    if value.isascii():
+        return value.translate(_NON_WORD_TABLE).lower()
+    return _NON_WORD_RE.sub('', value).lower()